@@ -10,12 +10,15 @@
 
 import os
 import sys
+import copy
 import math
 import random
+import operator
 import argparse
 import multiprocessing
 
 from enum import Enum
+import numpy as np
 import xml.etree.ElementTree as ET
 
 import rclpy
@@ -23,12 +26,15 @@ from rclpy.node import Node
 from rclpy.executors import ExternalShutdownException, MultiThreadedExecutor
 from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
 from rclpy.duration import Duration
+from rclpy.logging import LoggingSeverity
+from rclpy.qos import QoSProfile, QoSReliabilityPolicy, QoSDurabilityPolicy
 
 from ament_index_python.packages import get_package_share_directory
 
 from gazebo_msgs.msg import EntityState
 from gazebo_msgs.srv import SpawnEntity, GetModelList, GetEntityState, SetEntityState
 from geometry_msgs.msg import Pose, Twist
+from std_msgs.msg import Empty
 from assessment_interfaces.msg import ItemHolder, ItemHolders, ItemLog
 from auro_interfaces.srv import ItemRequest
 
@@ -41,11 +47,52 @@ HOME_ZONE_MAX_X = -3.0
 HOME_ZONE_MIN_Y = -3.0
 HOME_ZONE_MAX_Y =  3.0
 
+# Candidate cluster locations that clash with an obstacle.
+OBSTACLES = frozenset({(1, 1), (1, -1), (-1, 1), (-1, -1)})
+
+# Squared distance thresholds: for picking up an item, and between clusters.
+DISTANCE_SQ = 0.35 ** 2
+CLUSTER_SEPARATION_SQ = 1.0
+
+# Grid cell sizes for neighbour lookups, matching the minimum separation of clusters and of items in a cluster.
+CLUSTER_CELL_SIZE = 1.0
+ITEM_CELL_SIZE = 0.3
+
+def _d2(ax, ay, bx, by):
+    '''Returns the squared distance between (ax,ay) and (bx,by).'''
+    dx = ax - bx
+    dy = ay - by
+    return dx * dx + dy * dy
+
+def grid_cell(x, y, size):
+    '''Returns the key of the grid cell of the given size containing (x,y).'''
+    return (math.floor(x / size), math.floor(y / size))
+
+def grid_neighbours(grid, cell):
+    '''Yields the entries of a grid in the given cell and its eight neighbouring cells.'''
+    cx, cy = cell
+    for i in (cx - 1, cx, cx + 1):
+        for j in (cy - 1, cy, cy + 1):
+            yield from grid.get((i, j), ())
+
 class Colour(Enum):
     RED = 1
     GREEN = 2
     BLUE = 3
 
+_ALL_COLOURS = tuple(Colour)
+_COLOUR_NAMES = {colour: colour.name for colour in Colour}
+
+# Range of x coordinates in which clusters of each colour are placed.
+CLUSTER_X_RANGES = {
+    Colour.RED: (-2, -1),
+    Colour.GREEN: (-1, 1),
+    Colour.BLUE: (1, 2),
+}
+
+# Fetches per-colour entries of a dictionary in (red, green, blue) order.
+rgb_getter = operator.itemgetter(Colour.RED, Colour.GREEN, Colour.BLUE)
+
 class ZoneLocation(Enum):
     TOP_LEFT = 1
     TOP_RIGHT = 2
@@ -53,16 +100,21 @@ class ZoneLocation(Enum):
     BOTTOM_LEFT = 4
 
 class Zone():
+    __slots__ = ('location', 'x', 'y', 'items_returned', 'dominant_colour')
+
     def __init__(self, location, x, y):
         self.location = location
         self.x = x
         self.y = y
         self.items_returned = {}
+        self.dominant_colour = None
 
     def __repr__(self):
         return f'(location: {self.location}, x: {self.x}, y: {self.y}, items_returned: {self.items_returned})'
 
 class Item():
+    __slots__ = ('x', 'y', 'colour', 'cluster_id')
+
     def __init__(self, x, y, colour, cluster_id):
         self.x = x
         self.y = y
@@ -74,6 +126,8 @@ class Item():
 
 
 class Cluster():
+    __slots__ = ('x', 'y', 'colour')
+
     def __init__(self, x, y, colour):
         self.x = x
         self.y = y
@@ -84,6 +138,8 @@ class Cluster():
 
 
 class Robot():
+    __slots__ = ('x', 'y', 'item_held', 'previous_item_held')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -116,7 +172,6 @@ class ItemManager(Node):
 
         random.seed(self.args.random_seed)
 
-        self.first_run = True
         self.previous_time = self.get_clock().now()
 
         self.clusters = {}
@@ -138,6 +193,20 @@ class ItemManager(Node):
         # self.zones[ZoneLocation.BOTTOM_RIGHT] = Zone(ZoneLocation.BOTTOM_RIGHT, -1, 4.967)
         # self.zones[ZoneLocation.BOTTOM_LEFT] = Zone(ZoneLocation.BOTTOM_LEFT, -1, 0.0128)
 
+        # Zones do not change after start up, so their values are cached once. Their centres are packed
+        # into an array, in the same order as self._zone_list, for vectorised lookups.
+        self._zone_list = list(self.zones.values())
+        self._zone_xy = np.array([[zone.x, zone.y] for zone in self._zone_list], dtype=np.float32).reshape(-1, 2)
+
+        # Item positions packed into an array, kept in parallel with self.items, for vectorised proximity tests.
+        self._item_ids = []
+        self._item_index = {}
+        self._item_xy = np.empty((0, 2))
+
+        # Uniform grids used to find neighbouring clusters, and neighbouring items within a cluster.
+        self._cluster_grid = {}
+        self._item_grid_by_cluster = {}
+
         self.items_returned = {}
 
         self.cluster_counter = 0
@@ -148,10 +217,15 @@ class ItemManager(Node):
         self.item_values[Colour.GREEN] = 10
         self.item_values[Colour.BLUE] = 15
 
+        # Running totals of items returned across all zones, updated on offload.
+        self.items_returned_by_colour = {colour: 0 for colour in Colour}
+        self.value_by_colour = {colour: 0 for colour in Colour}
+        self.total_value = 0
+
         self.item_models = {}
 
         for colour in Colour:
-            for _, zone in self.zones.items():
+            for zone in self._zone_list:
                 zone.items_returned[colour] = 0
 
         self.tf_buffer = Buffer()
@@ -163,22 +237,34 @@ class ItemManager(Node):
         tree = ET.parse(item_model_path)
         root = tree.getroot()
 
-        self.item_models[Colour.RED] = ET.tostring(root, encoding='unicode')
-
+        # Serialise the model once with a placeholder material, from which each colour's model is derived.
         for node in root.iter("name"):
             for element in node.iter():
-                element.text = "green_outlined"
+                element.text = "__COLOUR__"
 
-        self.item_models[Colour.GREEN] = ET.tostring(root, encoding='unicode')
+        item_model_template = ET.tostring(root, encoding='unicode')
 
-        for node in root.iter("name"):
-            for element in node.iter():
-                element.text = "blue_outlined"
+        self.item_models[Colour.RED] = item_model_template.replace("__COLOUR__", "red_outlined")
+        self.item_models[Colour.GREEN] = item_model_template.replace("__COLOUR__", "green_outlined")
+        self.item_models[Colour.BLUE] = item_model_template.replace("__COLOUR__", "blue_outlined")
 
-        self.item_models[Colour.BLUE] = ET.tostring(root, encoding='unicode')
+        # Spawn requests prefilled with the model of each colour, copied on every spawn.
+        self._spawn_templates = {}
+        for colour in Colour:
+            request = SpawnEntity.Request()
+            request.xml = self.item_models[colour]
+            request.reference_frame = "world"
+            self._spawn_templates[colour] = request
+
+        # Messages published every tick, built once and updated in place.
+        self._item_holders_msg = ItemHolders()
+        self._holder_by_robot = {}
+        self._holder_item_held = {}
+        self._item_log_msg = ItemLog()
 
         client_callback_group = MutuallyExclusiveCallbackGroup()
         timer_callback_group = MutuallyExclusiveCallbackGroup()
+        init_callback_group = MutuallyExclusiveCallbackGroup()
         publisher_callback_group = MutuallyExclusiveCallbackGroup()
 
         self.spawn_entity_client = self.create_client(SpawnEntity, '/spawn_entity', callback_group=client_callback_group)
@@ -186,25 +272,45 @@ class ItemManager(Node):
         self.get_entity_state_client = self.create_client(GetEntityState, '/get_entity_state', callback_group=client_callback_group)
         self.set_entity_state_client = self.create_client(SetEntityState, '/set_entity_state', callback_group=client_callback_group)
 
+        # Services are waited for once here, before any timer or service callback can use them.
+        self.wait_for_services()
+
+        # Arena initialisation runs once in its own callback group, so that it does not delay the regular control loop.
+        self.init_timer = self.create_timer(0.0, self.initialize_arena, callback_group=init_callback_group)
         self.timer = self.create_timer(0.1, self.control_loop, callback_group=timer_callback_group)
 
         self.item_log_publisher = self.create_publisher(ItemLog, '/item_log', 10, callback_group=publisher_callback_group)
         self.item_holders_publisher = self.create_publisher(ItemHolders, '/item_holders', 10, callback_group=publisher_callback_group)
 
+        # Latched, so that late subscribers still learn that the arena has been initialised.
+        self.ready_publisher = self.create_publisher(
+            Empty,
+            '/item_manager/ready',
+            QoSProfile(reliability=QoSReliabilityPolicy.RELIABLE, durability=QoSDurabilityPolicy.TRANSIENT_LOCAL, depth=1),
+            callback_group=publisher_callback_group)
+
         # Provide services to collect item or offload item, but ensure no concurrency with regular control loop
         self.pick_up_service = self.create_service(ItemRequest, '/pick_up_item', self.pick_up_item, callback_group=timer_callback_group)
         self.offload_service = self.create_service(ItemRequest, '/offload_item', self.offload_item, callback_group=timer_callback_group)
     
+    def wait_for_services(self):
+        '''Blocks until all Gazebo services used by this node are available.'''
+        for client in (self.spawn_entity_client, self.get_model_list_client, self.get_entity_state_client, self.set_entity_state_client):
+            while not client.wait_for_service(timeout_sec=1.0):
+                self.get_logger().warn(f"Waiting for service '{client.srv_name}'...")
+
     def pick_up_item(self, request, response):
         '''
         Makes the robot whose 'robot_id' passed in the request to pick an item in the vicinity.
         The 'success' field of response is set to True if pick up succeeded, and otherwise
         is set to False. The 'message' field provides further details.
         '''
-        DISTANCE = 0.35
-
         response.success = False
-        self.get_logger().info(f"Incoming request on pick_up_item from robot_id '{request.robot_id}'")
+        # Per-request traces are only formatted when debug logging is enabled.
+        debug = self.get_logger().is_enabled_for(LoggingSeverity.DEBUG)
+
+        if debug:
+            self.get_logger().debug(f"Incoming request on pick_up_item from robot_id '{request.robot_id}'")
 
         # Get robot_id and check that it exists.
         if request.robot_id not in self.robots:
@@ -217,12 +323,18 @@ class ItemManager(Node):
                 response.success = False
                 response.message = f"Robot '{request.robot_id}' is already holding an item"
             else:
-                for item_id, item in self.items.items():
-                    # self.get_logger().info(f"Item '{item_id}': {item}")
-
-                    # Collects item if any is close enough.
-                    if math.dist((robot.x, robot.y), (item.x, item.y)) < DISTANCE:
-                        self.get_logger().info(f'{request.robot_id} collected {item_id}')
+                if self._item_ids:
+                    # Squared distance from the robot to every item. Items may still be added while the arena
+                    # is initialised, but ids are always appended before positions, so indexing ids is safe.
+                    diff = self._item_xy - np.array([robot.x, robot.y])
+                    d2 = np.einsum('ij,ij->i', diff, diff)
+                    nearest = int(np.argmin(d2))
+
+                    # Collects the nearest item if it is close enough.
+                    if d2[nearest] < DISTANCE_SQ:
+                        item_id = self._item_ids[nearest]
+                        if debug:
+                            self.get_logger().debug(f'{request.robot_id} collected {item_id}')
                         robot.item_held = item_id
                         response.success = True
                         response.message = f"Robot '{request.robot_id}' collected item successfully"
@@ -241,7 +353,11 @@ class ItemManager(Node):
         is is set to False. The 'message' field provides further details.
         '''
         response.success = False
-        self.get_logger().info('Incoming request on offload_item from robot_id: %s' % request.robot_id)
+        # Per-request traces are only formatted when debug logging is enabled.
+        debug = self.get_logger().is_enabled_for(LoggingSeverity.DEBUG)
+
+        if debug:
+            self.get_logger().debug(f"Incoming request on offload_item from robot_id '{request.robot_id}'")
 
         # Get robot_id and check that it exists.
         if request.robot_id not in self.robots:
@@ -255,7 +371,8 @@ class ItemManager(Node):
                 response.message = f"Robot '{request.robot_id}' does not hold any items, so unable to offload."
             else:
                 zone = self.get_robot_zone(robot)
-                self.get_logger().info(f"Robot is trying to offload '{robot.item_held}' at {zone}")
+                if debug:
+                    self.get_logger().debug(f"Robot is trying to offload '{robot.item_held}' at {zone}")
 
                 if not self.allowed_drop_in_zone(robot, zone):                    
                     # Need to put it back on the floor
@@ -274,12 +391,18 @@ class ItemManager(Node):
                     return response
                 else:
                     # Update zone count of number of items of this colour collected.
-                    zone.items_returned[self.items[robot.item_held].colour] += 1
+                    colour = self.items[robot.item_held].colour
+                    zone.items_returned[colour] += 1
+                    if zone.dominant_colour is None:
+                        zone.dominant_colour = colour
+                    self.items_returned_by_colour[colour] += 1
+                    self.value_by_colour[colour] += self.item_values[colour]
+                    self.total_value += self.item_values[colour]
+                    self.update_item_log()
                     x, y = self.generate_item_position(self.items[robot.item_held].cluster_id)
 
                     # Update stored item position
-                    self.items[robot.item_held].x = x
-                    self.items[robot.item_held].y = y
+                    self.set_item_position(robot.item_held, x, y)
 
                     # Update item location in simulation at absolute position, ie. world frame.
                     pose = Pose()
@@ -297,6 +420,16 @@ class ItemManager(Node):
         
         return response
     
+    def update_item_log(self):
+        '''Copies the running totals of items returned into the item log message.'''
+        item_log = self._item_log_msg
+
+        item_log.red_count, item_log.green_count, item_log.blue_count = rgb_getter(self.items_returned_by_colour)
+        item_log.total_count = item_log.red_count + item_log.green_count + item_log.blue_count
+
+        item_log.red_value, item_log.green_value, item_log.blue_value = rgb_getter(self.value_by_colour)
+        item_log.total_value = self.total_value
+
     def get_robot_zone(self, robot):
         '''Returns the zone the robot is currently in, and None if it is not anywhere near a zone.'''
         
@@ -304,50 +437,66 @@ class ItemManager(Node):
         ZONE_SIZE = 0.5
 
         # Assuming disjoint zones
-        for _, zone in self.zones.items():
-            if robot.x <= (zone.x + ZONE_SIZE) and robot.x >= (zone.x - ZONE_SIZE) and robot.y <= (zone.y + ZONE_SIZE) and robot.y >= (zone.y - ZONE_SIZE):
-                return zone
-
-        return None
+        inside = np.abs(self._zone_xy - np.array([robot.x, robot.y], dtype=np.float32)).max(axis=1) <= ZONE_SIZE
+        hits = np.flatnonzero(inside)
+
+        if hits.size == 0:
+            return None
+
+        return self._zone_list[hits[0]]
+
+    def add_cluster(self, cluster_id, cluster):
+        '''Stores a new cluster, indexing it in the cluster grid.'''
+        self.clusters[cluster_id] = cluster
+        self._cluster_grid.setdefault(grid_cell(cluster.x, cluster.y, CLUSTER_CELL_SIZE), []).append(cluster)
+        self._item_grid_by_cluster[cluster_id] = {}
+
+    def add_item(self, item_id, item):
+        '''Stores a new item, keeping the packed array of item positions and the item grid in sync.'''
+        self.items[item_id] = item
+        self._item_grid_by_cluster[item.cluster_id].setdefault(grid_cell(item.x, item.y, ITEM_CELL_SIZE), []).append(item)
+        self._item_index[item_id] = len(self._item_ids)
+        self._item_ids.append(item_id)
+        self._item_xy = np.vstack((self._item_xy, np.array([[item.x, item.y]])))
+
+    def set_item_position(self, item_id, x, y):
+        '''Updates the stored position of an item, keeping the packed array of item positions and the item grid in sync.'''
+        item = self.items[item_id]
+        old_cell = grid_cell(item.x, item.y, ITEM_CELL_SIZE)
+        new_cell = grid_cell(x, y, ITEM_CELL_SIZE)
+
+        if old_cell != new_cell:
+            item_grid = self._item_grid_by_cluster[item.cluster_id]
+            item_grid[old_cell].remove(item)
+            if not item_grid[old_cell]:
+                del item_grid[old_cell]
+            item_grid.setdefault(new_cell, []).append(item)
+
+        item.x = x
+        item.y = y
+        self._item_xy[self._item_index[item_id]] = (x, y)
 
     def allowed_drop_in_zone(self, robot, zone):
         '''Returns whether the robot is allowed to drop an item in the specified zone.'''
         if zone is None:
             return False
         else:
-            match_colour = None
-
-            for colour, count in zone.items_returned.items():
-                if count >= 1:
-                    match_colour = colour
-                    break
-
-            if match_colour == None or match_colour == self.items[robot.item_held].colour:
-                return True
-            else:
-                return False
+            # The first colour returned to a zone is the only one it accepts thereafter.
+            return zone.dominant_colour is None or zone.dominant_colour == self.items[robot.item_held].colour
 
     def generate_cluster_location(self, colour):
         while True:
             # Randomly generate a candidate cluster location
             y = random.randint(-2, 2)
-            match colour:
-                case Colour.RED:
-                    x = random.randint(-2, -1)
-                case Colour.GREEN:
-                    x = random.randint(-1, 1)
-                case Colour.BLUE:
-                    x = random.randint(1, 2)
-                case _:
-                    pass
+            x = random.randint(*CLUSTER_X_RANGES[colour])
 
             # Invalid if it clashes with an obstacle
-            if (x == 1 and y == 1) or (x == 1 and y == -1) or (x == -1 and y == 1) or (x == -1 and y == -1):
+            if (x, y) in OBSTACLES:
                 continue
 
-            # Invalid if it clashes with an existing cluster
-            for cluster in self.clusters.values():
-                if (cluster.x == x and cluster.y == y) or math.dist((cluster.x, cluster.y), (x, y)) <= 1.0:
+            # Invalid if it clashes with an existing cluster, only those in neighbouring cells can be close enough
+            for cluster in grid_neighbours(self._cluster_grid, grid_cell(x, y, CLUSTER_CELL_SIZE)):
+                if _d2(cluster.x, cluster.y, x, y) <= CLUSTER_SEPARATION_SQ:
                     break
             else:                    
                 return x, y
@@ -356,47 +505,43 @@ class ItemManager(Node):
     def generate_item_position(self, cluster_id):
         while True:
 
+            # Positions must be computed exactly like this, as any change to them can change how many
+            # candidates are rejected, and so the arena generated from a given random seed.
             radius = random.uniform(0, 0.5)
             angle = math.radians(random.uniform(0, 360))
 
             x = self.clusters[cluster_id].x + round(radius * math.cos(angle), 2)
             y = self.clusters[cluster_id].y + round(radius * math.sin(angle), 2)
 
-            for item in self.items.values():
-                if item.cluster_id == cluster_id and math.dist((item.x, item.y), (x, y)) < 0.3:
+            # Only items of this cluster in neighbouring cells can be close enough
+            for item in grid_neighbours(self._item_grid_by_cluster[cluster_id], grid_cell(x, y, ITEM_CELL_SIZE)):
+                # Not compared squared: items are exactly 0.3 apart often enough for the rounding to differ,
+                # which would change the arena generated from a given random seed.
+                if math.dist((item.x, item.y), (x, y)) < 0.3:
                     break
             else:
                 return x, y
 
     def spawn_item(self, name, x, y, colour, z = 0.0):
 
-        while not self.spawn_entity_client.wait_for_service():
-            pass
-
-        request = SpawnEntity.Request()
+        # Shallow copy shares the model XML with the template, so a fresh pose is used to avoid aliasing it.
+        request = copy.copy(self._spawn_templates[colour])
         request.name = name
-        request.xml = self.item_models[colour]
+        request.initial_pose = Pose()
         request.initial_pose.position.x = x
         request.initial_pose.position.y = y
         request.initial_pose.position.z = z
-        request.reference_frame = "world"
         self.item_counter += 1
         return self.spawn_entity_client.call_async(request)
 
 
     def get_model_list(self):
 
-        while not self.get_model_list_client.wait_for_service():
-            pass
-
         request = GetModelList.Request()
         return self.get_model_list_client.call_async(request)
 
     def get_entity_state(self, name):
 
-        while not self.get_entity_state_client.wait_for_service():
-            pass
-
         request = GetEntityState.Request()
         request.name = name
         return self.get_entity_state_client.call_async(request)
@@ -404,9 +549,6 @@ class ItemManager(Node):
 
     def set_entity_state(self, name, reference_frame, pose):
 
-        while not self.set_entity_state_client.wait_for_service():
-            pass
-
         state = EntityState()
         state.name = name
         state.pose = pose
@@ -419,52 +561,61 @@ class ItemManager(Node):
         return self.set_entity_state_client.call_async(request)
     
     # Initialize arena with items
-    def initialize_arena(self):
+    async def initialize_arena(self):
 
-        return False
-    
-    async def control_loop(self):
+        # Runs once, so the timer is cancelled before the first await.
+        self.init_timer.cancel()
 
-        if self.first_run:
-            self.first_run = False
+        # Spawn requests are all sent before awaiting any, so their round-trips overlap.
+        spawn_futures = []
 
-            for i in range(6):
+        for i in range(6):
 
-                valid = False
-                colour = random.choice(list(Colour))
+            valid = False
+            colour = random.choice(_ALL_COLOURS)
 
-                while not valid:
+            while not valid:
 
-                    count = 0
+                count = 0
 
-                    for cluster in self.clusters.values():
-                        if colour == cluster.colour:
-                            count += 1
-                
-                    if count < 2:
-                        valid = True
-                    else:
-                        colour = random.choice(list(Colour))
+                for cluster in self.clusters.values():
+                    if colour == cluster.colour:
+                        count += 1
+            
+                if count < 2:
+                    valid = True
+                else:
+                    colour = random.choice(_ALL_COLOURS)
+
+            cluster_id = "cluster" + str(self.cluster_counter)
+            self.cluster_counter += 1
 
-                cluster_id = "cluster" + str(self.cluster_counter)
-                self.cluster_counter += 1
+            x, y = self.generate_cluster_location(colour)
 
-                x, y = self.generate_cluster_location(colour)
+            self.add_cluster(cluster_id, Cluster(x, y, colour))
 
-                self.clusters[cluster_id] = Cluster(x, y, colour)
+            for j in range(random.randint(3, 5)):
 
-                for j in range(random.randint(3, 5)):
+                x, y = self.generate_item_position(cluster_id)
 
-                    x, y = self.generate_item_position(cluster_id)
+                item_id = "item" + str(self.item_counter)
+                self.add_item(item_id, Item(x, y, colour, cluster_id))
 
-                    item_id = "item" + str(self.item_counter)
-                    self.items[item_id] = Item(x, y, colour, cluster_id)
+                self.get_logger().info(f'Spawning {item_id} of {colour} at ({x:.2f}, {y:.2f})')
 
-                    self.get_logger().info(f'Spawning {item_id} of {colour} at ({x:.2f}, {y:.2f})')
+                spawn_futures.append(self.spawn_item(item_id, x, y, colour))
 
-                    await self.spawn_item(item_id, x, y, colour)
+        for future in spawn_futures:
+            await future
 
+        # Signals that all items are in place. The entity is still needed by spawn_robot_launch.py,
+        # whose spawner waits for it before spawning robots, while nodes can subscribe to the topic instead.
         await self.spawn_item("ready", 0.0, 0.0, Colour.RED, z=-0.5)
+        self.ready_publisher.publish(Empty())
+
+        self.destroy_timer(self.init_timer)
+
+    async def control_loop(self):
 
         model_list_msg = await self.get_model_list()
 
@@ -475,24 +626,32 @@ class ItemManager(Node):
                 if model_name not in self.robots:
                     self.robots[model_name] = Robot(0, 0)
 
-        for robot_id, robot in self.robots.items():
+                    item_holder = ItemHolder()
+                    item_holder.robot_id = model_name
+                    item_holder.holding_item = False
+                    item_holder.item_colour = ""
+                    item_holder.item_value = 0
+                    self._item_holders_msg.data.append(item_holder)
+                    self._holder_by_robot[model_name] = item_holder
+                    self._holder_item_held[model_name] = None
+
+        # All robots are polled every tick, as pick up relies on their position, but all requests
+        # are sent before awaiting any, so their round-trips overlap.
+        polls = [(robot, self.get_entity_state(robot_id)) for robot_id, robot in self.robots.items()]
+
+        for robot, future in polls:
 
-            entity_state_msg = await self.get_entity_state(robot_id)
+            entity_state_msg = await future
             robot_position = entity_state_msg.state.pose.position
 
             robot.x = round(robot_position.x, 2)
             robot.y = round(robot_position.y, 2)
 
-            for item_id, item in self.items.items():
-
-                # If item is that held by robot continue loop...
-                if item_id is robot.item_held:
-                    continue
+        for robot_id, robot in self.robots.items():
 
             if robot.item_held is not None:
                 # Update stored item position using robot's position
-                self.items[robot.item_held].x = robot.x
-                self.items[robot.item_held].y = robot.y
+                self.set_item_position(robot.item_held, robot.x, robot.y)
 
                 # self.get_logger().info(f'Item {robot.item_held} at ({self.items[robot.item_held].x}, {self.items[robot.item_held].y})')
 
@@ -505,13 +664,14 @@ class ItemManager(Node):
 
                 await self.set_entity_state(robot.item_held, robot_id, pose)
 
-        # Publish item holders
-        item_holders = ItemHolders()
-
+        # Publish item holders, only updating those whose held item has changed
         for robot_id, robot in self.robots.items():
-            
-            item_holder = ItemHolder()
-            item_holder.robot_id = robot_id
+
+            if robot.item_held == self._holder_item_held[robot_id]:
+                continue
+
+            item_holder = self._holder_by_robot[robot_id]
+            self._holder_item_held[robot_id] = robot.item_held
 
             if robot.item_held is None:
                 item_holder.holding_item = False
@@ -519,39 +679,14 @@ class ItemManager(Node):
                 item_holder.item_value = 0
             else:
                 item_holder.holding_item = True
-                item_holder.item_colour = self.items[robot.item_held].colour.name
-                item_holder.item_value = self.item_values[self.items[robot.item_held].colour]
+                colour = self.items[robot.item_held].colour
+                item_holder.item_colour = _COLOUR_NAMES[colour]
+                item_holder.item_value = self.item_values[colour]
 
-            item_holders.data.append(item_holder)
+        self.item_holders_publisher.publish(self._item_holders_msg)
 
-        self.item_holders_publisher.publish(item_holders)
-
-        # Publish item log
-        item_log = ItemLog()
-
-        # Use zones to publish number of coloured items retrieved
-        for colour in Colour:
-            match colour:
-                case Colour.RED:
-                    for _, zone in self.zones.items():
-                        item_log.red_count += zone.items_returned[colour]
-                case Colour.GREEN:
-                    for _, zone in self.zones.items():
-                        item_log.green_count += zone.items_returned[colour]
-                case Colour.BLUE:
-                    for _, zone in self.zones.items():
-                        item_log.blue_count += zone.items_returned[colour]
-                case _:
-                    pass
-
-        item_log.total_count = item_log.red_count + item_log.green_count + item_log.blue_count
-
-        item_log.red_value = item_log.red_count * self.item_values[Colour.RED]
-        item_log.green_value = item_log.green_count * self.item_values[Colour.GREEN]
-        item_log.blue_value = item_log.blue_count * self.item_values[Colour.BLUE]
-        item_log.total_value = item_log.red_value + item_log.green_value + item_log.blue_value
-
-        self.item_log_publisher.publish(item_log)
+        # Publish item log, which is only updated on offload
+        self.item_log_publisher.publish(self._item_log_msg)
 
 def main(args=sys.argv):
 
@@ -561,11 +696,14 @@ def main(args=sys.argv):
 
     node = ItemManager(args_without_ros)
 
-    if multiprocessing.cpu_count() >= 3:
-        executor = MultiThreadedExecutor()
+    # One thread per CPU this process may run on, but at least three, so that services can be called from within callbacks.
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
     else:
-        executor = MultiThreadedExecutor(num_threads=3)
-    
+        cpus = multiprocessing.cpu_count()
+
+    executor = MultiThreadedExecutor(num_threads=max(3, cpus))
+
     executor.add_node(node)
 
     try: